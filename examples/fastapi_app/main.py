@@ -1,29 +1,53 @@
 """Example FastAPI app using google-authz-client for authorization.
 
 This file demonstrates:
-- Creating a shared AsyncGoogleAuthzClient.
+- Creating a shared AsyncGoogleAuthzClient inside a lifespan handler.
 - Pulling the current user into a route with dependency injection.
 - Enforcing permissions per-route (single permission and any-of).
 - Combining multiple dependencies on a single route.
 """
 
-from fastapi import Depends, FastAPI
+from contextlib import asynccontextmanager
+
+import httpx
+from fastapi import Depends, FastAPI, Request
 
 from google_authz_client.client import AsyncGoogleAuthzClient
 from google_authz_client.fastapi import any_of, current_user, require_permission
 
-# Create a single client instance for the app lifecycle.
-authz_client = AsyncGoogleAuthzClient()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build one long-lived client per process so every request reuses the same
+    # connection pool, and close it cleanly on shutdown.
+    app.state.authz = AsyncGoogleAuthzClient(
+        client=httpx.AsyncClient(
+            base_url="http://localhost:8080",
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            timeout=httpx.Timeout(5.0),
+        ),
+    )
+    try:
+        yield
+    finally:
+        await app.state.authz.aclose()
+
+
+def get_authz_client(request: Request) -> AsyncGoogleAuthzClient:
+    # Resolver handed to the dependency factories; runs per request.
+    return request.app.state.authz
+
+
 # Basic FastAPI app setup with a human-readable title.
-app = FastAPI(title="google-authz-client example")
+app = FastAPI(title="google-authz-client example", lifespan=lifespan)
 
 
 @app.get("/inventory")
 async def list_inventory(
     # Resolve the current user from the incoming request (e.g., Authorization header).
-    auth=Depends(current_user(authz_client)),
+    auth=Depends(current_user(get_authz_client)),
     # Enforce that the user has the required permission for this route.
-    _=Depends(require_permission("inventory:read", client=authz_client)),
+    _=Depends(require_permission("inventory:read", client=get_authz_client)),
 ):
     # Return the authenticated subject and their permissions for demo purposes.
     return {"subject": auth.subject, "permissions": auth.permissions}
@@ -32,7 +56,7 @@ async def list_inventory(
 @app.post("/inventory")
 async def create_inventory_item(
     # Only users with "inventory:create" may access this endpoint.
-    _=Depends(require_permission("inventory:create", client=authz_client)),
+    _=Depends(require_permission("inventory:create", client=get_authz_client)),
 ):
     # In a real app, create the inventory item here.
     return {"status": "created"}
@@ -43,7 +67,7 @@ async def delete_inventory_item(
     # Path parameter provided by FastAPI routing.
     item_id: str,
     # Allow access if the user has either "inventory:delete" or "inventory:admin".
-    _=Depends(any_of(["inventory:delete", "inventory:admin"], client=authz_client)),
+    _=Depends(any_of(["inventory:delete", "inventory:admin"], client=get_authz_client)),
 ):
     # In a real app, delete the item from storage here.
     return {"status": "deleted", "item": item_id}
@@ -53,8 +77,8 @@ async def delete_inventory_item(
     "/bankrec/chase",
     status_code=200,
     dependencies=[
-        Depends(current_user(authz_client)),
-        Depends(require_permission("inventory:read", client=authz_client)),
+        Depends(current_user(get_authz_client)),
+        Depends(require_permission("inventory:read", client=get_authz_client)),
     ],
 )
 async def get_chase_bankrec():
@@ -0,0 +1,18 @@
+"""Build hook for the optional C accelerator.
+
+The package is pure Python; when Cython is installed at build time the token
+helpers in _token_fast.pyx are compiled as a speedup, otherwise the build
+proceeds without extensions and token.py uses its Python fallbacks.
+"""
+
+from setuptools import setup
+
+ext_modules = []
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    pass
+else:
+    ext_modules = cythonize(["src/google_authz_client/_token_fast.pyx"])
+
+setup(ext_modules=ext_modules)
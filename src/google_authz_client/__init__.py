@@ -1,9 +1,13 @@
 """google-authz client helpers for Python frameworks."""
 
+from typing import TYPE_CHECKING
+
 from .client import AsyncGoogleAuthzClient, GoogleAuthzClient
-from .config import GoogleAuthzSettings
 from .models import EffectiveAuth, PermissionCheckResult
 
+if TYPE_CHECKING:  # pragma: no cover - import is deferred at runtime
+    from .config import GoogleAuthzSettings
+
 __all__ = [
     "AsyncGoogleAuthzClient",
     "EffectiveAuth",
@@ -13,3 +17,13 @@ __all__ = [
 ]
 
 __version__ = "0.5.0"
+
+
+def __getattr__(name: str):
+    # Defer the pydantic import until settings are actually used, so consumers
+    # that configure clients directly never pay the import cost.
+    if name == "GoogleAuthzSettings":
+        from .config import GoogleAuthzSettings
+
+        return GoogleAuthzSettings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,61 @@
+# cython: language_level=3
+"""Optional C-accelerated token helpers.
+
+Compiled only when Cython is available at build time; token.py falls back to
+the pure-Python implementations when this module is absent.
+"""
+
+cdef extern from "Python.h":
+    const char* PyUnicode_AsUTF8AndSize(object o, Py_ssize_t *size) except NULL
+
+cdef extern from *:
+    """
+    #include <stdint.h>
+    #include <string.h>
+    #include <strings.h>
+
+    /* "bearer \\0" packed little-endian, with an OR-0x20 lowercase mask over
+     * the six letter bytes only — the space byte is compared exactly, so a
+     * NUL there cannot masquerade as the separator. One unaligned load +
+     * mask + compare replaces a byte-wise case-insensitive loop. */
+    #define GA_LOWER_MASK  0x0000202020202020ULL
+    #define GA_BEARER_WORD 0x0020726572616562ULL
+
+    static int ga_is_little_endian(void) {
+        const uint16_t one = 1;
+        return *(const unsigned char *)&one == 1;
+    }
+
+    static inline int ga_is_bearer_prefix(const char *s, Py_ssize_t n) {
+        uint64_t w;
+        if (n >= 8 && ga_is_little_endian()) {
+            memcpy(&w, s, 8);          /* safe: n >= 8 bytes are readable */
+            w &= 0x00FFFFFFFFFFFFFFULL; /* byte 8 belongs to the token */
+            w |= GA_LOWER_MASK;
+            return w == GA_BEARER_WORD;
+        }
+        return n >= 7 && strncasecmp(s, "bearer ", 7) == 0;
+    }
+    """
+    int ga_is_bearer_prefix(const char *s, Py_ssize_t n) nogil
+
+
+cpdef bint is_bearer_prefix(bytes data):
+    """Exposed for tests: SWAR case-insensitive check for a 'bearer ' prefix."""
+    return ga_is_bearer_prefix(data, len(data))
+
+
+cpdef extract_bearer_token(header_value):
+    """C fast path mirroring token._extract_bearer_token_uncached."""
+    if header_value is None or header_value == "":
+        return None
+    cdef str value = (<str>header_value).strip()
+    if not value:
+        return None
+    cdef Py_ssize_t n
+    cdef const char* buf = PyUnicode_AsUTF8AndSize(value, &n)
+    # "bearer " is pure ASCII, so a 7-byte match means the first seven
+    # characters are also the first seven bytes and the slice below is safe.
+    if ga_is_bearer_prefix(buf, n):
+        return value[7:].lstrip()
+    return value
@@ -2,15 +2,64 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, MutableMapping, Optional
+import asyncio
+import concurrent.futures
+import functools
+import hashlib
+import threading
+import time
+from typing import Any, Dict, List, MutableMapping, Optional, Sequence, Tuple, cast
 
 import httpx
+from cachetools import TLRUCache, TTLCache
+
+try:  # orjson is optional; fall back to httpx's stdlib json handling.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+try:  # HTTP/2 needs the optional h2 package; stay on HTTP/1.1 without it.
+    import h2  # noqa: F401
+except ImportError:  # pragma: no cover - depends on the environment
+    _HTTP2_AVAILABLE = False
+else:
+    _HTTP2_AVAILABLE = True
 
 from .errors import GoogleAuthzError, MissingCredentialsError
 from .models import EffectiveAuth, PermissionCheckResult
 
 EffectiveAuthCache = Optional[MutableMapping[str, EffectiveAuth]]
 
+DEFAULT_TOKEN_CACHE_TTL_SECONDS = 300.0
+DEFAULT_TOKEN_CACHE_MAXSIZE = 10_000
+DEFAULT_CHECK_CACHE_TTL_SECONDS = 10.0
+DEFAULT_CHECK_CACHE_MAXSIZE = 20_000
+DEFAULT_MAX_CONNECTIONS = 200
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 50
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 30.0
+# Expire cached auth this long before the token's own exp claim to avoid races.
+_EXP_LEEWAY_SECONDS = 60.0
+
+_VALID_TOKEN_TYPES = frozenset({"id_token", "session_token", "access_token"})
+
+
+def _token_cache_key(token: str) -> bytes:
+    # Hash so raw tokens are never retained in the process-wide cache.
+    return hashlib.sha256(token.encode()).digest()
+
+
+@functools.lru_cache(maxsize=2048)
+def _bearer(token: str) -> str:
+    # Tokens repeat across the fetch + check calls of a request and across
+    # requests from the same caller; memoize the header value, not the dict.
+    return "Bearer " + token
+
+
+def _decode_json(response: httpx.Response) -> Any:
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
 
 class _BaseClient:
     def __init__(
@@ -22,46 +71,139 @@ class _BaseClient:
         shared_secret: Optional[str],
         shared_secret_header: str,
         token_type: str,
+        token_cache_ttl_seconds: float,
+        token_cache_maxsize: int,
+        check_cache_ttl_seconds: float,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.timeout_seconds = timeout_seconds
         self.verify_tls = verify_tls
         self.shared_secret = shared_secret
         self.shared_secret_header = shared_secret_header
-        if token_type not in {"id_token", "session_token", "access_token"}:
+        if token_type not in _VALID_TOKEN_TYPES:
             raise ValueError("token_type must be 'id_token', 'session_token', or 'access_token'")
         self.token_type = token_type
+        # Parse the hot endpoint URLs once so httpx skips per-call URL parsing.
+        self._authz_url = httpx.URL("/authz")
+        self._check_url = httpx.URL("/authz/check")
+        self._check_batch_url = httpx.URL("/authz/check:batch")
+        # Static request headers never change for the client's lifetime; copy
+        # per call instead of rebuilding them.
+        self._static_headers: Dict[str, str] = {"Accept": "application/json"}
+        if shared_secret:
+            self._static_headers[shared_secret_header] = shared_secret
+        self.token_cache_ttl_seconds = token_cache_ttl_seconds
+        self._token_cache: Optional[TLRUCache] = None
+        self._token_cache_lock = threading.Lock()
+        if token_cache_ttl_seconds > 0:
+            self._token_cache = TLRUCache(
+                maxsize=token_cache_maxsize,
+                ttu=self._token_cache_ttu,
+                timer=time.time,
+            )
+        # Short-TTL cache for /authz/check results; absorbs bursts of repeat
+        # (token, module, action) checks, denials included, while keeping
+        # revocation staleness bounded.
+        self._check_cache: Optional[TTLCache] = None
+        self._check_cache_lock = threading.Lock()
+        if check_cache_ttl_seconds > 0:
+            self._check_cache = TTLCache(
+                maxsize=DEFAULT_CHECK_CACHE_MAXSIZE,
+                ttl=check_cache_ttl_seconds,
+            )
+
+    def _token_cache_ttu(self, _key: bytes, auth: EffectiveAuth, now: float) -> float:
+        expires = now + self.token_cache_ttl_seconds
+        exp = auth.raw.get("exp")
+        if isinstance(exp, (int, float)):
+            expires = min(expires, float(exp) - _EXP_LEEWAY_SECONDS)
+        return expires
+
+    def _cached_auth(self, token: str) -> Optional[EffectiveAuth]:
+        if self._token_cache is None:
+            return None
+        with self._token_cache_lock:
+            return self._token_cache.get(_token_cache_key(token))
+
+    def _store_auth(self, token: str, auth: EffectiveAuth) -> None:
+        if self._token_cache is None:
+            return
+        with self._token_cache_lock:
+            self._token_cache[_token_cache_key(token)] = auth
+
+    def invalidate(self, token: str) -> None:
+        """Drop any cached effective auth for the supplied token."""
+        if self._token_cache is None:
+            return
+        with self._token_cache_lock:
+            self._token_cache.pop(_token_cache_key(token), None)
+
+    def _cached_check(self, token: str, module: str, action: str) -> Optional[PermissionCheckResult]:
+        if self._check_cache is None:
+            return None
+        with self._check_cache_lock:
+            return self._check_cache.get((_token_cache_key(token), module, action))
+
+    def _store_check(self, token: str, module: str, action: str, result: PermissionCheckResult) -> None:
+        if self._check_cache is None:
+            return
+        with self._check_cache_lock:
+            self._check_cache[(_token_cache_key(token), module, action)] = result
+
+    def invalidate_token(self, token: str) -> None:
+        """Drop cached effective auth and permission checks for the token."""
+        self.invalidate(token)
+        if self._check_cache is None:
+            return
+        key_hash = _token_cache_key(token)
+        with self._check_cache_lock:
+            stale = [key for key in self._check_cache if key[0] == key_hash]
+            for key in stale:
+                del self._check_cache[key]
 
     def _headers(self, token: str | None) -> Dict[str, str]:
         if not token:
             raise MissingCredentialsError("Token is required for google-authz calls")
-        headers = {
-            "Accept": "application/json",
-            "Authorization": f"Bearer {token}",
-        }
-        if self.shared_secret:
-            headers[self.shared_secret_header] = self.shared_secret
+        headers = self._static_headers.copy()
+        headers["Authorization"] = _bearer(token)
         return headers
 
     def _token_payload(self, token: str, token_type: Optional[str]) -> Dict[str, str]:
         if not token:
             raise MissingCredentialsError("Token is required for google-authz calls")
-        chosen_type = token_type or self.token_type
-        if chosen_type not in {"id_token", "session_token", "access_token"}:
+        if token_type is None:
+            # Fast path: the type was validated once at construction time.
+            return {self.token_type: token}
+        if token_type not in _VALID_TOKEN_TYPES:
             raise ValueError("token_type must be 'id_token', 'session_token', or 'access_token'")
-        return {chosen_type: token}
+        return {token_type: token}
 
     def _effective_auth_from_payload(self, payload: Dict[str, Any]) -> EffectiveAuth:
         subject = str(payload.get("subject") or payload.get("user", "anonymous"))
         permissions = payload.get("permissions") or {}
-        normalized: Dict[str, list[str]] = {}
-        for module, actions in permissions.items():
-            if isinstance(actions, (list, tuple, set)):
-                normalized[module] = [str(action) for action in actions]
-            elif isinstance(actions, str):
-                normalized[module] = [actions]
+        if type(permissions) is dict and all(type(actions) is list for actions in permissions.values()):
+            # Fast path: JSON decoding already produced Dict[str, List[str]],
+            # so skip the per-action coercion below.
+            normalized: Dict[str, frozenset[str]] = {
+                module: frozenset(actions) for module, actions in permissions.items()
+            }
+        else:
+            normalized = {}
+            for module, actions in permissions.items():
+                if isinstance(actions, (list, tuple, set)):
+                    normalized[module] = frozenset(str(action) for action in actions)
+                elif isinstance(actions, str):
+                    normalized[module] = frozenset((actions,))
         return EffectiveAuth(subject=subject, permissions=normalized, raw=payload)
 
+    def _request_kwargs(self, token: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Build post() kwargs, serializing with orjson when available."""
+        headers = self._headers(token)
+        if orjson is not None:
+            headers["Content-Type"] = "application/json"
+            return {"headers": headers, "content": orjson.dumps(body)}
+        return {"headers": headers, "json": body}
+
     def _raise_for_status(self, response: httpx.Response) -> None:
         try:
             response.raise_for_status()
@@ -70,7 +212,11 @@ class _BaseClient:
 
 
 class GoogleAuthzClient(_BaseClient):
-    """Synchronous, long-lived httpx client."""
+    """Synchronous, long-lived httpx client.
+
+    Construct one instance per process and reuse it; each instance owns a
+    connection pool (HTTP/2 when the optional h2 package is installed).
+    """
 
     def __init__(
         self,
@@ -81,6 +227,11 @@ class GoogleAuthzClient(_BaseClient):
         shared_secret: Optional[str] = None,
         shared_secret_header: str = "X-Authz-Shared-Secret",
         token_type: str = "id_token",
+        token_cache_ttl_seconds: float = DEFAULT_TOKEN_CACHE_TTL_SECONDS,
+        token_cache_maxsize: int = DEFAULT_TOKEN_CACHE_MAXSIZE,
+        check_cache_ttl_seconds: float = DEFAULT_CHECK_CACHE_TTL_SECONDS,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
         client: Optional[httpx.Client] = None,
     ) -> None:
         super().__init__(
@@ -90,12 +241,24 @@ class GoogleAuthzClient(_BaseClient):
             shared_secret=shared_secret,
             shared_secret_header=shared_secret_header,
             token_type=token_type,
+            token_cache_ttl_seconds=token_cache_ttl_seconds,
+            token_cache_maxsize=token_cache_maxsize,
+            check_cache_ttl_seconds=check_cache_ttl_seconds,
         )
         self._client = client or httpx.Client(
             base_url=self.base_url,
             timeout=httpx.Timeout(self.timeout_seconds),
             verify=self.verify_tls,
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY_SECONDS,
+            ),
         )
+        self._inflight_lock = threading.Lock()
+        self._inflight_auth: Dict[str, concurrent.futures.Future] = {}
+        self._inflight_checks: Dict[Tuple[str, str, str], concurrent.futures.Future] = {}
 
     def close(self) -> None:
         self._client.close()
@@ -107,20 +270,45 @@ class GoogleAuthzClient(_BaseClient):
         cache: EffectiveAuthCache = None,
         token_type: Optional[str] = None,
     ) -> EffectiveAuth:
+        cached_auth = self._cached_auth(token)
+        if cached_auth is not None:
+            if cache is not None:
+                cache[token] = cached_auth
+            return cached_auth
         if cache and token in cache:
             cached = cache[token]
             if isinstance(cached, EffectiveAuth):
                 return cached
-        response = self._client.post(
-            "/authz",
-            headers=self._headers(token),
-            json=self._token_payload(token, token_type),
-        )
-        self._raise_for_status(response)
-        payload = response.json()
-        auth = self._effective_auth_from_payload(payload)
+        with self._inflight_lock:
+            existing = self._inflight_auth.get(token)
+            if existing is None:
+                future: concurrent.futures.Future = concurrent.futures.Future()
+                self._inflight_auth[token] = future
+        if existing is not None:
+            # Another thread already issued this fetch; block on its result.
+            auth = existing.result()
+            if cache is not None:
+                cache[token] = auth
+            return auth
+        try:
+            response = self._client.post(
+                self._authz_url,
+                **self._request_kwargs(token, self._token_payload(token, token_type)),
+            )
+            self._raise_for_status(response)
+            payload = _decode_json(response)
+            auth = self._effective_auth_from_payload(payload)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(auth)
+        finally:
+            with self._inflight_lock:
+                self._inflight_auth.pop(token, None)
         if cache is not None:
             cache[token] = auth
+        self._store_auth(token, auth)
         return auth
 
     def check_permission(
@@ -130,21 +318,45 @@ class GoogleAuthzClient(_BaseClient):
         token: str,
         token_type: Optional[str] = None,
     ) -> PermissionCheckResult:
-        response = self._client.post(
-            "/authz/check",
-            headers=self._headers(token),
-            json={
-                "module": module,
-                "action": action,
-                **self._token_payload(token, token_type),
-            },
-        )
-        self._raise_for_status(response)
-        return PermissionCheckResult.from_payload(response.json())
+        cached = self._cached_check(token, module, action)
+        if cached is not None:
+            return cached
+        key = (token, module, action)
+        with self._inflight_lock:
+            existing = self._inflight_checks.get(key)
+            if existing is None:
+                future: concurrent.futures.Future = concurrent.futures.Future()
+                self._inflight_checks[key] = future
+        if existing is not None:
+            return existing.result()
+        try:
+            body = self._token_payload(token, token_type)
+            body["module"] = module
+            body["action"] = action
+            response = self._client.post(
+                self._check_url,
+                **self._request_kwargs(token, body),
+            )
+            self._raise_for_status(response)
+            result = PermissionCheckResult.from_payload(_decode_json(response))
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            self._store_check(token, module, action, result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight_checks.pop(key, None)
 
 
 class AsyncGoogleAuthzClient(_BaseClient):
-    """Async httpx variant used by FastAPI and other async stacks."""
+    """Async httpx variant used by FastAPI and other async stacks.
+
+    Construct one instance per process and reuse it; each instance owns a
+    connection pool (HTTP/2 when the optional h2 package is installed).
+    """
 
     def __init__(
         self,
@@ -155,6 +367,11 @@ class AsyncGoogleAuthzClient(_BaseClient):
         shared_secret: Optional[str] = None,
         shared_secret_header: str = "X-Authz-Shared-Secret",
         token_type: str = "id_token",
+        token_cache_ttl_seconds: float = DEFAULT_TOKEN_CACHE_TTL_SECONDS,
+        token_cache_maxsize: int = DEFAULT_TOKEN_CACHE_MAXSIZE,
+        check_cache_ttl_seconds: float = DEFAULT_CHECK_CACHE_TTL_SECONDS,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
         client: Optional[httpx.AsyncClient] = None,
     ) -> None:
         super().__init__(
@@ -164,16 +381,36 @@ class AsyncGoogleAuthzClient(_BaseClient):
             shared_secret=shared_secret,
             shared_secret_header=shared_secret_header,
             token_type=token_type,
+            token_cache_ttl_seconds=token_cache_ttl_seconds,
+            token_cache_maxsize=token_cache_maxsize,
+            check_cache_ttl_seconds=check_cache_ttl_seconds,
         )
         self._client = client or httpx.AsyncClient(
             base_url=self.base_url,
             timeout=httpx.Timeout(self.timeout_seconds),
             verify=self.verify_tls,
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY_SECONDS,
+            ),
         )
+        # Single-threaded asyncio: no lock needed around these maps.
+        self._inflight_auth: Dict[str, asyncio.Task[EffectiveAuth]] = {}
+        self._inflight_checks: Dict[Tuple[str, str, str], asyncio.Task[PermissionCheckResult]] = {}
 
     async def aclose(self) -> None:
         await self._client.aclose()
 
+    @staticmethod
+    def _pop_inflight(inflight: Dict[Any, asyncio.Task], key: Any, task: asyncio.Task) -> None:
+        inflight.pop(key, None)
+        if not task.cancelled():
+            # Mark any exception retrieved so asyncio stays quiet when every
+            # coalesced waiter was cancelled before the task finished.
+            task.exception()
+
     async def fetch_effective_auth(
         self,
         token: str,
@@ -181,20 +418,40 @@ class AsyncGoogleAuthzClient(_BaseClient):
         cache: EffectiveAuthCache = None,
         token_type: Optional[str] = None,
     ) -> EffectiveAuth:
+        cached_auth = self._cached_auth(token)
+        if cached_auth is not None:
+            if cache is not None:
+                cache[token] = cached_auth
+            return cached_auth
         if cache and token in cache:
             cached = cache[token]
             if isinstance(cached, EffectiveAuth):
                 return cached
+        task = self._inflight_auth.get(token)
+        if task is None:
+            # The fetch runs in its own task so cancelling any caller — the
+            # first one included — cannot fail the coalesced waiters; the
+            # shield below only detaches each caller's own cancellation.
+            task = asyncio.ensure_future(self._fetch_effective_auth_uncached(token, token_type))
+            self._inflight_auth[token] = task
+            task.add_done_callback(
+                functools.partial(self._pop_inflight, self._inflight_auth, token)
+            )
+        auth = await asyncio.shield(task)
+        if cache is not None:
+            cache[token] = auth
+        return auth
+
+    async def _fetch_effective_auth_uncached(
+        self, token: str, token_type: Optional[str]
+    ) -> EffectiveAuth:
         response = await self._client.post(
-            "/authz",
-            headers=self._headers(token),
-            json=self._token_payload(token, token_type),
+            self._authz_url,
+            **self._request_kwargs(token, self._token_payload(token, token_type)),
         )
         self._raise_for_status(response)
-        payload = response.json()
-        auth = self._effective_auth_from_payload(payload)
-        if cache is not None:
-            cache[token] = auth
+        auth = self._effective_auth_from_payload(_decode_json(response))
+        self._store_auth(token, auth)
         return auth
 
     async def check_permission(
@@ -204,14 +461,71 @@ class AsyncGoogleAuthzClient(_BaseClient):
         token: str,
         token_type: Optional[str] = None,
     ) -> PermissionCheckResult:
+        cached = self._cached_check(token, module, action)
+        if cached is not None:
+            return cached
+        key = (token, module, action)
+        task = self._inflight_checks.get(key)
+        if task is None:
+            # Same decoupling as fetch_effective_auth: the shared check must
+            # survive the disconnect of whichever request started it.
+            task = asyncio.ensure_future(
+                self._check_permission_uncached(module, action, token, token_type)
+            )
+            self._inflight_checks[key] = task
+            task.add_done_callback(
+                functools.partial(self._pop_inflight, self._inflight_checks, key)
+            )
+        return await asyncio.shield(task)
+
+    async def _check_permission_uncached(
+        self, module: str, action: str, token: str, token_type: Optional[str]
+    ) -> PermissionCheckResult:
+        body = self._token_payload(token, token_type)
+        body["module"] = module
+        body["action"] = action
         response = await self._client.post(
-            "/authz/check",
-            headers=self._headers(token),
-            json={
-                "module": module,
-                "action": action,
-                **self._token_payload(token, token_type),
-            },
+            self._check_url,
+            **self._request_kwargs(token, body),
         )
         self._raise_for_status(response)
-        return PermissionCheckResult.from_payload(response.json())
+        result = PermissionCheckResult.from_payload(_decode_json(response))
+        self._store_check(token, module, action, result)
+        return result
+
+    async def check_permissions(
+        self,
+        perms: Sequence[Tuple[str, str]],
+        token: str,
+        token_type: Optional[str] = None,
+    ) -> List[PermissionCheckResult]:
+        """Check several (module, action) pairs with a single round-trip."""
+        results: List[Optional[PermissionCheckResult]] = []
+        missing: List[Tuple[int, str, str]] = []
+        for index, (module, action) in enumerate(perms):
+            cached = self._cached_check(token, module, action)
+            results.append(cached)
+            if cached is None:
+                missing.append((index, module, action))
+        if missing:
+            body = self._token_payload(token, token_type)
+            body["checks"] = [{"module": module, "action": action} for _, module, action in missing]
+            response = await self._client.post(
+                self._check_batch_url,
+                **self._request_kwargs(token, body),
+            )
+            self._raise_for_status(response)
+            payload = _decode_json(response)
+            batch_results = payload.get("results") or []
+            if len(batch_results) != len(missing):
+                # Fail closed: a short or missing results list must not be
+                # mistaken for "every remaining check passed".
+                raise GoogleAuthzError(
+                    f"Batch check returned {len(batch_results)} results "
+                    f"for {len(missing)} checks"
+                )
+            for (index, module, action), item in zip(missing, batch_results):
+                result = PermissionCheckResult.from_payload(item)
+                self._store_check(token, module, action, result)
+                results[index] = result
+        return cast(List[PermissionCheckResult], results)
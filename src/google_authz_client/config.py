@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from typing import TYPE_CHECKING, Optional
 
-from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
+import httpx
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
 
 DEFAULT_BASE_URL = "http://localhost:8080"
 ENV_PREFIX = "GOOGLE_AUTHZ_"
@@ -14,6 +16,7 @@ if TYPE_CHECKING:  # pragma: no cover - the real imports happen lazily below
     from .client import AsyncGoogleAuthzClient, GoogleAuthzClient
 
 
+@lru_cache(maxsize=None)
 def _env_key(field_name: str) -> str:
     return f"{ENV_PREFIX}{field_name.upper()}"
 
@@ -23,7 +26,7 @@ class GoogleAuthzSettings(BaseModel):
 
     model_config = ConfigDict(extra="ignore")
 
-    base_url: HttpUrl | str = Field(DEFAULT_BASE_URL, description="google-authz base URL")
+    base_url: str = Field(DEFAULT_BASE_URL, description="google-authz base URL")
     timeout_seconds: float = Field(5.0, description="HTTP timeout for authz requests")
     verify_tls: bool = Field(True, description="Disable only for local testing")
     shared_secret: Optional[str] = Field(
@@ -34,6 +37,18 @@ class GoogleAuthzSettings(BaseModel):
         default="X-Authz-Shared-Secret",
         description="Header name used when shared_secret is provided",
     )
+    token_cache_ttl_seconds: float = Field(
+        default=300.0,
+        description="TTL for the process-wide verified-token cache; 0 disables it",
+    )
+    max_connections: int = Field(
+        default=200,
+        description="Connection-pool cap for the default httpx client",
+    )
+    max_keepalive_connections: int = Field(
+        default=50,
+        description="Idle keep-alive connections retained in the pool",
+    )
 
     def __init__(self, **data):
         # Pull env vars that were not explicitly provided.
@@ -47,29 +62,45 @@ class GoogleAuthzSettings(BaseModel):
         merged_data = {**env_values, **data}
         super().__init__(**merged_data)
 
+    _parsed_url: httpx.URL = PrivateAttr()
+
     @field_validator("base_url", mode="before")
     @classmethod
     def _strip_trailing_slash(cls, value: str) -> str:
         return value.rstrip("/") if isinstance(value, str) else value
 
+    def model_post_init(self, __context) -> None:
+        # Parse once; httpx validation is much cheaper than pydantic's HttpUrl
+        # and the clients consume httpx URLs anyway.
+        try:
+            self._parsed_url = httpx.URL(self.base_url)
+        except httpx.InvalidURL as exc:
+            raise ValueError(f"base_url is not a valid URL: {exc}") from exc
+
     def build_client(self) -> "GoogleAuthzClient":
         from .client import GoogleAuthzClient
 
         return GoogleAuthzClient(
-            base_url=str(self.base_url),
+            base_url=str(self._parsed_url),
             timeout_seconds=self.timeout_seconds,
             verify_tls=self.verify_tls,
             shared_secret=self.shared_secret,
             shared_secret_header=self.shared_secret_header,
+            token_cache_ttl_seconds=self.token_cache_ttl_seconds,
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
         )
 
     def build_async_client(self) -> "AsyncGoogleAuthzClient":
         from .client import AsyncGoogleAuthzClient
 
         return AsyncGoogleAuthzClient(
-            base_url=str(self.base_url),
+            base_url=str(self._parsed_url),
             timeout_seconds=self.timeout_seconds,
             verify_tls=self.verify_tls,
             shared_secret=self.shared_secret,
             shared_secret_header=self.shared_secret_header,
+            token_cache_ttl_seconds=self.token_cache_ttl_seconds,
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
         )
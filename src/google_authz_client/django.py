@@ -6,7 +6,7 @@ from functools import wraps
 from typing import Callable
 
 from .client import GoogleAuthzClient
-from .token import discover_token
+from .token import discover_token_fast
 
 
 def _import_django() -> tuple[object, object]:
@@ -36,7 +36,7 @@ class GoogleAuthzMiddleware:
         self.attach_to_user = bool(getattr(settings, "GOOGLE_AUTHZ_ATTACH_TO_USER", False))
 
     def __call__(self, request):
-        token = discover_token(request.headers, request.COOKIES, self.cookie_name, self.header_name)
+        token = discover_token_fast(request, self.cookie_name, self.header_name)
         if token:
             cache = getattr(request, "_google_authz_cache", None)
             if cache is None:
@@ -67,7 +67,7 @@ def require_permission(
     def decorator(view_func: Callable) -> Callable:
         @wraps(view_func)
         def _wrapped_view(request: HttpRequest, *args, **kwargs):
-            token = discover_token(request.headers, request.COOKIES, cookie_name, header_name)
+            token = discover_token_fast(request, cookie_name, header_name)
             if not token:
                 raise PermissionDenied("Missing credentials")
             result = client.check_permission(module, action, token)
@@ -2,28 +2,94 @@
 
 from __future__ import annotations
 
-from typing import Awaitable, Callable, Iterable, List, Sequence
+from typing import Awaitable, Callable, Iterable, List, MutableMapping, Sequence, Tuple
 
 from fastapi import Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 
-from .client import AsyncGoogleAuthzClient
+from .client import AsyncGoogleAuthzClient, GoogleAuthzClient
 from .errors import GoogleAuthzError
 from .models import EffectiveAuth
-from .token import discover_token
+from .token import discover_token_fast
 
 CacheFactory = Callable[[], dict[str, EffectiveAuth]]
 
+# Factories accept either a ready client or a per-request resolver, so apps can
+# build the client inside a lifespan handler and look it up from app.state.
+ClientSource = AsyncGoogleAuthzClient | Callable[[Request], AsyncGoogleAuthzClient]
 
-def _get_cache(request: Request) -> dict[str, EffectiveAuth]:
+
+def _resolve_client(source: ClientSource, request: Request) -> AsyncGoogleAuthzClient:
+    if isinstance(source, (AsyncGoogleAuthzClient, GoogleAuthzClient)):
+        return source
+    return source(request)
+
+
+async def _fetch_effective_auth(client, token: str, cache) -> EffectiveAuth:
+    if isinstance(client, AsyncGoogleAuthzClient):
+        return await client.fetch_effective_auth(token, cache=cache)
+    if isinstance(client, GoogleAuthzClient):
+        # A sync client would block the event loop; offload to the threadpool.
+        return await run_in_threadpool(client.fetch_effective_auth, token, cache=cache)
+    raise TypeError("client must be an AsyncGoogleAuthzClient or GoogleAuthzClient")
+
+
+async def _check_permission(client, module: str, action: str, token: str):
+    if isinstance(client, AsyncGoogleAuthzClient):
+        return await client.check_permission(module, action, token)
+    if isinstance(client, GoogleAuthzClient):
+        return await run_in_threadpool(client.check_permission, module, action, token)
+    raise TypeError("client must be an AsyncGoogleAuthzClient or GoogleAuthzClient")
+
+
+async def _check_permissions(client, perms: List[Tuple[str, str]], token: str):
+    if isinstance(client, AsyncGoogleAuthzClient):
+        return await client.check_permissions(perms, token)
+    if isinstance(client, GoogleAuthzClient):
+        # The sync client has no batch endpoint helper; run the individual
+        # checks off the event loop instead.
+        return [
+            await run_in_threadpool(client.check_permission, module, action, token)
+            for module, action in perms
+        ]
+    raise TypeError("client must be an AsyncGoogleAuthzClient or GoogleAuthzClient")
+
+
+def _parse_permissions(permissions: Iterable[str]) -> Tuple[Tuple[str, str, str], ...]:
+    """Split 'module:action' strings once, at factory time."""
+    parsed = []
+    for permission in permissions:
+        try:
+            module, action = permission.split(":", 1)
+        except ValueError as exc:
+            raise ValueError("Permission must look like 'module:action'") from exc
+        parsed.append((permission, module, action))
+    return tuple(parsed)
+
+
+def _get_cache(request: Request) -> MutableMapping[str, EffectiveAuth]:
+    # Per-request only: cross-request reuse comes from the client's own
+    # process-wide cache, which honors invalidation, TTL settings and the
+    # token exp claim. A second shared layer here would bypass all three.
     cache = getattr(request.state, "_google_authz_cache", None)
     if cache is None:
         cache = {}
-        setattr(request.state, "_google_authz_cache", cache)
+        request.state._google_authz_cache = cache
     return cache
 
 
+def _get_token(request: Request, cookie_name: str, header_name: str) -> str | None:
+    """Discover the caller token once per request and reuse it across deps."""
+    token = getattr(request.state, "_google_authz_token", None)
+    if token is None:
+        token = discover_token_fast(request, cookie_name, header_name)
+        if token is not None:
+            request.state._google_authz_token = token
+    return token
+
+
 def current_user(
-    client: AsyncGoogleAuthzClient,
+    client: ClientSource,
     *,
     cookie_name: str = "session",
     header_name: str = "authorization",
@@ -31,14 +97,18 @@ def current_user(
     """Return a dependency that resolves EffectiveAuth for the inbound request."""
 
     async def dependency(request: Request) -> EffectiveAuth:
-        token = discover_token(request.headers, request.cookies, cookie_name, header_name)
+        auth = getattr(request.state, "_google_authz_auth", None)
+        if auth is not None:
+            return auth
+        token = _get_token(request, cookie_name, header_name)
         if not token:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing credentials")
         cache = _get_cache(request)
         try:
-            auth = await client.fetch_effective_auth(token, cache=cache)
+            auth = await _fetch_effective_auth(_resolve_client(client, request), token, cache)
         except GoogleAuthzError as exc:  # pragma: no cover - defensive
             raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+        request.state._google_authz_auth = auth
         return auth
 
     return dependency
@@ -47,7 +117,7 @@ def current_user(
 def require_permission(
     permission: str,
     *,
-    client: AsyncGoogleAuthzClient,
+    client: ClientSource,
     return_actions: bool = False,
     cookie_name: str = "session",
     header_name: str = "authorization",
@@ -62,10 +132,16 @@ def require_permission(
         request: Request,
         auth: EffectiveAuth = Depends(current_user(client, cookie_name=cookie_name, header_name=header_name)),
     ) -> EffectiveAuth | List[str]:
-        token = discover_token(request.headers, request.cookies, cookie_name, header_name)
+        # The fetched EffectiveAuth is authoritative for modules it lists, so
+        # most requests never need the extra /authz/check round-trip.
+        if auth.allows(module, action):
+            return auth.permitted_actions(module) if return_actions else auth
+        if module in auth.permissions:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+        token = _get_token(request, cookie_name, header_name)
         if not token:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing credentials")
-        result = await client.check_permission(module, action, token)
+        result = await _check_permission(_resolve_client(client, request), module, action, token)
         if not result.allowed:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
         return result.permitted_actions if return_actions else auth
@@ -76,24 +152,31 @@ def require_permission(
 def any_of(
     permissions: Sequence[str],
     *,
-    client: AsyncGoogleAuthzClient,
+    client: ClientSource,
     cookie_name: str = "session",
     header_name: str = "authorization",
 ) -> Callable[[Request], Awaitable[EffectiveAuth]]:
     """Dependency that allows the request if any permission passes."""
+    parsed = _parse_permissions(permissions)
 
     async def dependency(
         request: Request,
         auth: EffectiveAuth = Depends(current_user(client, cookie_name=cookie_name, header_name=header_name)),
     ) -> EffectiveAuth:
-        token = discover_token(request.headers, request.cookies, cookie_name, header_name)
-        if not token:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing credentials")
-        for permission in permissions:
-            module, action = permission.split(":", 1)
-            result = await client.check_permission(module, action, token)
-            if result.allowed:
+        remote: List[Tuple[str, str]] = []
+        for _permission, module, action in parsed:
+            if auth.allows(module, action):
                 return auth
+            if module not in auth.permissions:
+                remote.append((module, action))
+        if remote:
+            token = _get_token(request, cookie_name, header_name)
+            if not token:
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing credentials")
+            results = await _check_permissions(_resolve_client(client, request), remote, token)
+            for result in results:
+                if result.allowed:
+                    return auth
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
     return dependency
@@ -102,27 +185,40 @@ def any_of(
 def all_of(
     permissions: Iterable[str],
     *,
-    client: AsyncGoogleAuthzClient,
+    client: ClientSource,
     cookie_name: str = "session",
     header_name: str = "authorization",
 ) -> Callable[[Request], Awaitable[EffectiveAuth]]:
     """Dependency that requires all listed permissions."""
+    parsed = _parse_permissions(permissions)
 
     async def dependency(
         request: Request,
         auth: EffectiveAuth = Depends(current_user(client, cookie_name=cookie_name, header_name=header_name)),
     ) -> EffectiveAuth:
-        token = discover_token(request.headers, request.cookies, cookie_name, header_name)
-        if not token:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing credentials")
-        for permission in permissions:
-            module, action = permission.split(":", 1)
-            result = await client.check_permission(module, action, token)
-            if not result.allowed:
+        remote: List[Tuple[str, str]] = []
+        remote_permissions: List[str] = []
+        for permission, module, action in parsed:
+            if auth.allows(module, action):
+                continue
+            if module in auth.permissions:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail=f"Missing permission {permission}",
                 )
+            remote.append((module, action))
+            remote_permissions.append(permission)
+        if remote:
+            token = _get_token(request, cookie_name, header_name)
+            if not token:
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing credentials")
+            results = await _check_permissions(_resolve_client(client, request), remote, token)
+            for permission, result in zip(remote_permissions, results):
+                if not result.allowed:
+                    raise HTTPException(
+                        status_code=status.HTTP_403_FORBIDDEN,
+                        detail=f"Missing permission {permission}",
+                    )
         return auth
 
     return dependency
@@ -9,7 +9,7 @@ from flask import Flask, abort, g, request
 
 from .client import GoogleAuthzClient
 from .models import EffectiveAuth
-from .token import discover_token
+from .token import discover_token_fast
 
 
 def _get_cache() -> dict[str, EffectiveAuth]:
@@ -21,7 +21,7 @@ def _get_cache() -> dict[str, EffectiveAuth]:
 
 
 def _get_token(cookie_name: str, header_name: str) -> str | None:
-    return discover_token(request.headers, request.cookies, cookie_name, header_name)
+    return discover_token_fast(request, cookie_name, header_name)
 
 
 def register_current_user_middleware(
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List
+from typing import Dict, FrozenSet, Iterable, List
 
 
 @dataclass(slots=True)
@@ -11,17 +11,17 @@ class EffectiveAuth:
     """Represents the `/authz` response for a caller."""
 
     subject: str
-    permissions: Dict[str, List[str]] = field(default_factory=dict)
+    permissions: Dict[str, FrozenSet[str]] = field(default_factory=dict)
     raw: Dict[str, object] = field(default_factory=dict)
 
     def allows(self, module: str, action: str) -> bool:
         """Return True when the caller may perform action within module."""
-        actions = self.permissions.get(module, [])
-        return action in actions or "*" in actions
+        actions = self.permissions.get(module)
+        return actions is not None and (action in actions or "*" in actions)
 
     def permitted_actions(self, module: str) -> List[str]:
         """Return the actions granted for the supplied module."""
-        return list(self.permissions.get(module, []))
+        return sorted(self.permissions.get(module, ()))
 
 
 @dataclass(slots=True)
@@ -40,10 +40,12 @@ class PermissionCheckResult:
 
     @classmethod
     def from_payload(cls, payload: Dict[str, object]) -> "PermissionCheckResult":
-        allowed = bool(payload.get("allowed"))
-        actions = payload.get("permitted_actions") or []
-        if isinstance(actions, Iterable) and not isinstance(actions, (str, bytes)):
+        actions = payload.get("permitted_actions")
+        if type(actions) is list:
+            # Fast path: JSON decoding always yields a fresh, unaliased list.
+            permitted = actions
+        elif isinstance(actions, Iterable) and not isinstance(actions, (str, bytes)):
             permitted = list(actions)
         else:
             permitted = []
-        return cls(allowed=allowed, permitted_actions=permitted)
+        return cls(allowed=bool(payload.get("allowed")), permitted_actions=permitted)
@@ -2,49 +2,114 @@
 
 from __future__ import annotations
 
-from typing import Mapping, MutableMapping, Optional
+from functools import lru_cache
+from typing import Any, Callable, Mapping, Optional, Tuple, Union
 
 BEARER_PREFIX = "bearer "
+_BEARER_LEN = len(BEARER_PREFIX)
 
+# Frameworks parse the Cookie header lazily; accepting a callable lets callers
+# defer that work until the Authorization header has been ruled out.
+CookieSource = Union[Mapping[str, str], Callable[[], Mapping[str, str]]]
 
-def extract_bearer_token(header_value: Optional[str]) -> Optional[str]:
+
+def _extract_bearer_token_uncached(header_value: Optional[str]) -> Optional[str]:
     if not header_value:
         return None
     value = header_value.strip()
-    if value.lower().startswith(BEARER_PREFIX):
-        return value[len(BEARER_PREFIX) :].strip()
+    # Lowercase only the prefix-sized slice; lowercasing the whole value would
+    # copy the full token (JWTs run to kilobytes) just to compare 7 bytes.
+    if len(value) >= _BEARER_LEN and value[:_BEARER_LEN].lower() == BEARER_PREFIX:
+        # strip() above already removed trailing whitespace.
+        return value[_BEARER_LEN:].lstrip()
     return value or None
 
 
+try:  # Optional C accelerator, built only when Cython was present.
+    from ._token_fast import extract_bearer_token as _extract_bearer_token_impl
+except ImportError:  # pragma: no cover - depends on the build
+    _extract_bearer_token_impl = _extract_bearer_token_uncached
+
+# The same Authorization header value recurs across the dependencies of one
+# request tree and across requests from one caller; memoize the parse. The
+# cache is bounded, and header strings are hashable, so this is safe.
+extract_bearer_token = lru_cache(maxsize=1024)(_extract_bearer_token_impl)
+
+
+def clear_cache() -> None:
+    """Reset the memoized header parse (mainly for test isolation)."""
+    extract_bearer_token.cache_clear()
+
+
+@lru_cache(maxsize=32)
+def _header_name_variants(header_name: str) -> Tuple[str, str, str]:
+    # Only a handful of header names ever flow through here, so the
+    # title/lower spellings are computed once per name instead of per request.
+    return header_name, header_name.title(), header_name.lower()
+
+
 def discover_token(
     headers: Mapping[str, str],
-    cookies: Mapping[str, str],
+    cookies: CookieSource,
+    cookie_name: str = "session",
+    header_name: str = "authorization",
+) -> Optional[str]:
+    """Attempt to extract a bearer or session token.
+
+    The Authorization header is inspected first so that cookie parsing (a
+    dict copy per access in Starlette) is skipped entirely on
+    header-authenticated requests.
+    """
+    # Framework header mappings (httpx, Starlette, Werkzeug) are already
+    # case-insensitive, so direct get() calls hit a normalized bucket; only
+    # plain dicts fall through to the linear scan.
+    name, titled, target = _header_name_variants(header_name)
+    header = headers.get(name)
+    if header is None:
+        header = headers.get(titled)
+    if header is None:
+        for key, value in headers.items():
+            if key.lower() == target:
+                header = value
+                break
+    token = extract_bearer_token(header)
+    if token:
+        return token
+    if callable(cookies):
+        cookies = cookies()
+    return cookies.get(cookie_name) or None
+
+
+def discover_token_fast(
+    request: Any,
     cookie_name: str = "session",
     header_name: str = "authorization",
 ) -> Optional[str]:
-    """Attempt to extract a session or bearer token."""
-    cookie = cookies.get(cookie_name)
-    if cookie:
-        return cookie
-    header = None
-    for key, value in headers.items():
-        if key.lower() == header_name.lower():
-            header = value
-            break
-    return extract_bearer_token(header)
+    """Extract a token straight from a framework request object.
 
+    Starlette, Werkzeug and Django requests all expose a case-insensitive
+    header mapping, so a single get() replaces the spelling fallbacks in
+    :func:`discover_token`, and cookies are only touched (and therefore only
+    parsed) when the Authorization header yields nothing.
+    """
+    token = extract_bearer_token(request.headers.get(header_name))
+    if token:
+        return token
+    cookies = getattr(request, "cookies", None)
+    if cookies is None:
+        cookies = getattr(request, "COOKIES", None)
+        if cookies is None:
+            return None
+    return cookies.get(cookie_name) or None
 
-class RequestScopedCache:
-    """Lightweight per-request cache for effective auth payloads."""
 
-    def __init__(self) -> None:
-        self._store: MutableMapping[str, object] = {}
+class RequestScopedCache(dict):
+    """Lightweight per-request cache for effective auth payloads.
 
-    def get(self, key: str) -> Optional[object]:
-        return self._store.get(key)
+    A bare dict subclass: get/clear come straight from dict's C
+    implementation and no __dict__ is allocated per instance.
+    """
 
-    def set(self, key: str, value: object) -> None:
-        self._store[key] = value
+    __slots__ = ()
 
-    def clear(self) -> None:
-        self._store.clear()
+    set = dict.__setitem__
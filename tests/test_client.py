@@ -1,9 +1,19 @@
+import asyncio
 import json
 
 import httpx
 import pytest
 
 from google_authz_client.client import AsyncGoogleAuthzClient, GoogleAuthzClient
+from google_authz_client.errors import GoogleAuthzError
+
+# Precomputed response bodies shared across handlers so MockTransport never
+# re-serializes the same JSON per request.
+_JSON_HEADERS = {"content-type": "application/json"}
+_AUTHZ_ALICE = b'{"subject": "alice", "permissions": {}}'
+_AUTHZ_ALICE_READ = b'{"subject": "alice", "permissions": {"inventory": ["read"]}}'
+_CHECK_ALLOWED_READ = b'{"allowed": true, "permitted_actions": ["read"]}'
+_CHECK_DENIED = b'{"allowed": false, "permitted_actions": []}'
 
 
 def test_fetch_effective_auth_uses_cache():
@@ -15,10 +25,7 @@ def test_fetch_effective_auth_uses_cache():
             payload = json.loads(request.content.decode())
             assert payload == {"id_token": "token"}
             calls["authz"] += 1
-            return httpx.Response(
-                200,
-                json={"subject": "alice", "permissions": {"inventory": ["read"]}},
-            )
+            return httpx.Response(200, content=_AUTHZ_ALICE_READ, headers=_JSON_HEADERS)
         raise AssertionError("Unexpected path")
 
     transport = httpx.MockTransport(handler)
@@ -34,16 +41,54 @@ def test_fetch_effective_auth_uses_cache():
     assert calls["authz"] == 1
 
 
+def test_fetch_effective_auth_uses_process_wide_cache():
+    calls = {"authz": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["authz"] += 1
+        return httpx.Response(200, content=_AUTHZ_ALICE, headers=_JSON_HEADERS)
+
+    transport = httpx.MockTransport(handler)
+    http_client = httpx.Client(transport=transport, base_url="https://authz.local")
+    client = GoogleAuthzClient(client=http_client, base_url="https://authz.local")
+
+    auth1 = client.fetch_effective_auth("token")
+    auth2 = client.fetch_effective_auth("token")
+    assert auth2 is auth1
+    assert calls["authz"] == 1
+
+    client.invalidate("token")
+    client.fetch_effective_auth("token")
+    assert calls["authz"] == 2
+
+
+def test_fetch_effective_auth_cache_disabled_with_zero_ttl():
+    calls = {"authz": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["authz"] += 1
+        return httpx.Response(200, content=_AUTHZ_ALICE, headers=_JSON_HEADERS)
+
+    transport = httpx.MockTransport(handler)
+    http_client = httpx.Client(transport=transport, base_url="https://authz.local")
+    client = GoogleAuthzClient(
+        client=http_client,
+        base_url="https://authz.local",
+        token_cache_ttl_seconds=0,
+    )
+
+    client.fetch_effective_auth("token")
+    client.fetch_effective_auth("token")
+    assert calls["authz"] == 2
+
+
 def test_check_permission_parses_response():
     def handler(request: httpx.Request) -> httpx.Response:
         if request.url.path == "/authz/check":
             payload = json.loads(request.content.decode())
             assert payload == {"module": "inventory", "action": "read", "id_token": "token"}
-            return httpx.Response(
-                200,
-                json={"allowed": True, "permitted_actions": ["read"]},
-            )
-        return httpx.Response(200, json={"subject": "alice", "permissions": {}})
+            return httpx.Response(200, content=_CHECK_ALLOWED_READ, headers=_JSON_HEADERS)
+        return httpx.Response(200, content=_AUTHZ_ALICE, headers=_JSON_HEADERS)
 
     transport = httpx.MockTransport(handler)
     http_client = httpx.Client(transport=transport, base_url="https://authz.local")
@@ -54,17 +99,39 @@ def test_check_permission_parses_response():
     assert result.permitted_actions == ["read"]
 
 
+def test_check_permission_caches_denials_briefly():
+    calls = {"check": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["check"] += 1
+        return httpx.Response(200, content=_CHECK_DENIED, headers=_JSON_HEADERS)
+
+    transport = httpx.MockTransport(handler)
+    http_client = httpx.Client(transport=transport, base_url="https://authz.local")
+    client = GoogleAuthzClient(client=http_client, base_url="https://authz.local")
+
+    result1 = client.check_permission("inventory", "delete", "token")
+    result2 = client.check_permission("inventory", "delete", "token")
+    assert result1.allowed is False
+    assert result2 is result1
+    assert calls["check"] == 1
+
+    client.invalidate_token("token")
+    client.check_permission("inventory", "delete", "token")
+    assert calls["check"] == 2
+
+
 @pytest.mark.asyncio
 async def test_async_client_calls_endpoints():
     def handler(request: httpx.Request) -> httpx.Response:
         if request.url.path == "/authz":
             payload = json.loads(request.content.decode())
             assert payload == {"id_token": "token"}
-            return httpx.Response(200, json={"subject": "alice", "permissions": {}})
+            return httpx.Response(200, content=_AUTHZ_ALICE, headers=_JSON_HEADERS)
         if request.url.path == "/authz/check":
             payload = json.loads(request.content.decode())
             assert payload == {"module": "inventory", "action": "read", "id_token": "token"}
-            return httpx.Response(200, json={"allowed": False, "permitted_actions": []})
+            return httpx.Response(200, content=_CHECK_DENIED, headers=_JSON_HEADERS)
         raise AssertionError("Unexpected path")
 
     transport = httpx.MockTransport(handler)
@@ -77,3 +144,114 @@ async def test_async_client_calls_endpoints():
 
     result = await client.check_permission("inventory", "read", "token")
     assert result.allowed is False
+
+
+@pytest.mark.asyncio
+async def test_async_check_permissions_posts_one_batch():
+    calls = {"batch": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/authz/check:batch"
+        payload = json.loads(request.content.decode())
+        assert payload == {
+            "checks": [
+                {"module": "inventory", "action": "read"},
+                {"module": "inventory", "action": "delete"},
+            ],
+            "id_token": "token",
+        }
+        calls["batch"] += 1
+        return httpx.Response(
+            200,
+            json={"results": [{"allowed": True, "permitted_actions": ["read"]}, {"allowed": False}]},
+        )
+
+    transport = httpx.MockTransport(handler)
+    async_http_client = httpx.AsyncClient(transport=transport, base_url="https://authz.local")
+    client = AsyncGoogleAuthzClient(client=async_http_client, base_url="https://authz.local")
+
+    results = await client.check_permissions([("inventory", "read"), ("inventory", "delete")], "token")
+
+    assert [result.allowed for result in results] == [True, False]
+    assert calls["batch"] == 1
+
+
+@pytest.mark.asyncio
+async def test_async_check_permissions_rejects_short_batch_response():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b'{"results": []}', headers=_JSON_HEADERS)
+
+    transport = httpx.MockTransport(handler)
+    async_http_client = httpx.AsyncClient(transport=transport, base_url="https://authz.local")
+    client = AsyncGoogleAuthzClient(client=async_http_client, base_url="https://authz.local")
+
+    # A malformed batch reply must fail closed instead of dropping checks.
+    with pytest.raises(GoogleAuthzError):
+        await client.check_permissions([("inventory", "read"), ("inventory", "delete")], "token")
+
+
+@pytest.mark.asyncio
+async def test_async_fetch_effective_auth_coalesces_concurrent_calls():
+    calls = {"authz": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls["authz"] += 1
+        await asyncio.sleep(0)
+        return httpx.Response(200, content=_AUTHZ_ALICE, headers=_JSON_HEADERS)
+
+    transport = httpx.MockTransport(handler)
+    async_http_client = httpx.AsyncClient(transport=transport, base_url="https://authz.local")
+    client = AsyncGoogleAuthzClient(client=async_http_client, base_url="https://authz.local")
+
+    auths = await asyncio.gather(*(client.fetch_effective_auth("token") for _ in range(5)))
+
+    assert all(auth.subject == "alice" for auth in auths)
+    assert calls["authz"] == 1
+
+
+@pytest.mark.asyncio
+async def test_async_fetch_effective_auth_survives_leader_cancellation():
+    started = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        started.set()
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, content=_AUTHZ_ALICE, headers=_JSON_HEADERS)
+
+    transport = httpx.MockTransport(handler)
+    async_http_client = httpx.AsyncClient(transport=transport, base_url="https://authz.local")
+    client = AsyncGoogleAuthzClient(client=async_http_client, base_url="https://authz.local")
+
+    # A client disconnect cancels the request coroutine that started the
+    # fetch; the coalesced waiters must still get a result.
+    leader = asyncio.ensure_future(client.fetch_effective_auth("token"))
+    await started.wait()
+    waiters = [asyncio.ensure_future(client.fetch_effective_auth("token")) for _ in range(3)]
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    auths = await asyncio.gather(*waiters)
+    assert all(auth.subject == "alice" for auth in auths)
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_async_check_permission_coalesces_concurrent_calls():
+    calls = {"check": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls["check"] += 1
+        await asyncio.sleep(0)
+        return httpx.Response(200, content=_CHECK_ALLOWED_READ, headers=_JSON_HEADERS)
+
+    transport = httpx.MockTransport(handler)
+    async_http_client = httpx.AsyncClient(transport=transport, base_url="https://authz.local")
+    client = AsyncGoogleAuthzClient(client=async_http_client, base_url="https://authz.local")
+
+    results = await asyncio.gather(
+        *(client.check_permission("inventory", "read", "token") for _ in range(5))
+    )
+
+    assert all(result.allowed for result in results)
+    assert calls["check"] == 1
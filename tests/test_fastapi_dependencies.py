@@ -3,8 +3,9 @@ import json
 import httpx
 import pytest
 
+from google_authz_client import token as token_module
 from google_authz_client.client import AsyncGoogleAuthzClient
-from google_authz_client.fastapi import current_user, require_permission
+from google_authz_client.fastapi import all_of, any_of, current_user, require_permission
 
 fastapi = pytest.importorskip("fastapi")
 testclient_module = pytest.importorskip("fastapi.testclient")
@@ -13,64 +14,215 @@ Depends = fastapi.Depends
 FastAPI = fastapi.FastAPI
 TestClient = testclient_module.TestClient
 
+# Precomputed response bodies so the mock handler never re-serializes JSON.
+_JSON_HEADERS = {"content-type": "application/json"}
+_AUTHZ_GOOD = b'{"subject": "good-token", "permissions": {"inventory": ["read"]}}'
+_AUTHZ_ANON = b'{"subject": "anon", "permissions": {}}'
+_CHECK_ALLOWED = b'{"allowed": true, "permitted_actions": ["read"]}'
+_CHECK_DENIED = b'{"allowed": false, "permitted_actions": []}'
+
+
+@pytest.fixture(autouse=True)
+def _isolate_shared_caches():
+    # The token parse cache is process-global; clear it so neither strategy
+    # parameterization is served from the other's state.
+    token_module.clear_cache()
+
+
+def _build_mock_async_client(strategy: str):
+    # The service accepts the token either in the request body or via the
+    # Authorization header; exercise both without duplicating the suite.
+    def token_from(request: httpx.Request) -> str:
+        if strategy == "header":
+            return request.headers.get("authorization", "").removeprefix("Bearer ")
+        payload = json.loads(request.content.decode())
+        return payload.get("id_token", "")
 
-def _build_mock_async_client():
     def handler(request: httpx.Request) -> httpx.Response:
         if request.url.path == "/authz":
-            payload = json.loads(request.content.decode())
-            token = payload.get("id_token", "")
+            good = token_from(request) == "good-token"
             return httpx.Response(
                 200,
-                json={
-                    "subject": token or "anon",
-                    "permissions": {"inventory": ["read"]},
-                },
+                content=_AUTHZ_GOOD if good else _AUTHZ_ANON,
+                headers=_JSON_HEADERS,
             )
         if request.url.path == "/authz/check":
-            payload = json.loads(request.content.decode())
-            token = payload.get("id_token", "")
-            allowed = token == "good-token"
-            payload = {"allowed": allowed, "permitted_actions": ["read"] if allowed else []}
-            return httpx.Response(200, json=payload)
+            good = token_from(request) == "good-token"
+            return httpx.Response(
+                200,
+                content=_CHECK_ALLOWED if good else _CHECK_DENIED,
+                headers=_JSON_HEADERS,
+            )
         raise AssertionError("Unexpected path")
 
     transport = httpx.MockTransport(handler)
     return httpx.AsyncClient(transport=transport, base_url="https://authz.local")
 
 
-def create_test_app() -> FastAPI:
-    async_client = _build_mock_async_client()
-    authz_client = AsyncGoogleAuthzClient(client=async_client, base_url="https://authz.local")
+@pytest.fixture(scope="module", params=["header", "body"])
+def authz_client(request):
+    # One client (and one underlying connection pool) per token-delivery
+    # strategy, mirroring the production pattern of pinning the client to
+    # app.state.
+    return AsyncGoogleAuthzClient(
+        client=_build_mock_async_client(request.param),
+        base_url="https://authz.local",
+    )
 
+
+@pytest.fixture(scope="module")
+def app(authz_client):
+    # FastAPI app construction is comparatively expensive; build once per
+    # strategy.
+    return create_test_app(authz_client)
+
+
+@pytest.fixture(scope="module")
+def client(app):
+    # TestClient spins up a transport per instance; share one across the
+    # module's tests.
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _app_state_client(request):
+    return request.app.state.authz_client
+
+
+def create_test_app(authz_client: AsyncGoogleAuthzClient) -> FastAPI:
     app = FastAPI()
+    app.state.authz_client = authz_client
 
     @app.get("/inventory")
     async def read_inventory(
-        auth=Depends(current_user(authz_client)),
-        _=Depends(require_permission("inventory:read", client=authz_client)),
+        auth=Depends(current_user(_app_state_client)),
+        _=Depends(require_permission("inventory:read", client=_app_state_client)),
     ):
         return {"subject": auth.subject}
 
     return app
 
 
-def test_fastapi_dependency_allows_authorized_call():
-    app = create_test_app()
-    client = TestClient(app)
+def test_fastapi_dependency_allows_authorized_call(client):
     response = client.get("/inventory", headers={"Authorization": "Bearer good-token"})
     assert response.status_code == 200
     assert response.json()["subject"] == "good-token"
 
 
-def test_fastapi_dependency_blocks_invalid_permission():
-    app = create_test_app()
-    client = TestClient(app)
+def test_fastapi_dependency_blocks_invalid_permission(client):
     response = client.get("/inventory", headers={"Authorization": "Bearer bad-token"})
     assert response.status_code == 403
 
 
-def test_fastapi_dependency_requires_token():
-    app = create_test_app()
-    client = TestClient(app)
+def test_fastapi_dependency_requires_token(client):
     response = client.get("/inventory")
     assert response.status_code == 401
+
+
+def _build_batch_test_app(factory, permissions):
+    # good-token holds inventory:read locally; only reports:view passes the
+    # remote batch check. Counters expose which endpoints each dependency hit.
+    calls = {"authz": 0, "check": 0, "batch": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/authz":
+            calls["authz"] += 1
+            return httpx.Response(200, content=_AUTHZ_GOOD, headers=_JSON_HEADERS)
+        if request.url.path == "/authz/check":
+            calls["check"] += 1
+            return httpx.Response(200, content=_CHECK_DENIED, headers=_JSON_HEADERS)
+        if request.url.path == "/authz/check:batch":
+            calls["batch"] += 1
+            payload = json.loads(request.content.decode())
+            results = [
+                {"allowed": check == {"module": "reports", "action": "view"}}
+                for check in payload["checks"]
+            ]
+            return httpx.Response(200, json={"results": results})
+        raise AssertionError("Unexpected path")
+
+    transport = httpx.MockTransport(handler)
+    authz_client = AsyncGoogleAuthzClient(
+        client=httpx.AsyncClient(transport=transport, base_url="https://authz.local"),
+        base_url="https://authz.local",
+    )
+
+    app = FastAPI()
+
+    @app.get("/resource")
+    async def read_resource(auth=Depends(factory(permissions, client=authz_client))):
+        return {"subject": auth.subject}
+
+    return app, calls
+
+
+def test_fastapi_any_of_local_allow_skips_remote_checks():
+    app, calls = _build_batch_test_app(any_of, ["inventory:read", "reports:view"])
+    response = TestClient(app).get("/resource", headers={"Authorization": "Bearer good-token"})
+    assert response.status_code == 200
+    assert calls["check"] == 0
+    assert calls["batch"] == 0
+
+
+def test_fastapi_any_of_falls_back_to_remote_batch():
+    app, calls = _build_batch_test_app(any_of, ["reports:view"])
+    response = TestClient(app).get("/resource", headers={"Authorization": "Bearer good-token"})
+    assert response.status_code == 200
+    assert calls["batch"] == 1
+
+    app, calls = _build_batch_test_app(any_of, ["secrets:read"])
+    response = TestClient(app).get("/resource", headers={"Authorization": "Bearer good-token"})
+    assert response.status_code == 403
+    assert calls["batch"] == 1
+
+
+def test_fastapi_all_of_denies_action_missing_from_local_module():
+    # inventory is listed in the /authz payload, so the missing delete action
+    # is an authoritative local deny; no remote call may be made.
+    app, calls = _build_batch_test_app(all_of, ["inventory:read", "inventory:delete"])
+    response = TestClient(app).get("/resource", headers={"Authorization": "Bearer good-token"})
+    assert response.status_code == 403
+    assert calls["check"] == 0
+    assert calls["batch"] == 0
+
+
+def test_fastapi_all_of_checks_unknown_modules_remotely():
+    app, calls = _build_batch_test_app(all_of, ["inventory:read", "reports:view"])
+    response = TestClient(app).get("/resource", headers={"Authorization": "Bearer good-token"})
+    assert response.status_code == 200
+    assert calls["batch"] == 1
+
+    app, calls = _build_batch_test_app(all_of, ["inventory:read", "secrets:read"])
+    response = TestClient(app).get("/resource", headers={"Authorization": "Bearer good-token"})
+    assert response.status_code == 403
+    assert calls["batch"] == 1
+
+
+def test_fastapi_dependency_offloads_sync_client():
+    from google_authz_client.client import GoogleAuthzClient
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/authz":
+            return httpx.Response(
+                200,
+                json={"subject": "alice", "permissions": {"inventory": ["read"]}},
+            )
+        raise AssertionError("Unexpected path")
+
+    transport = httpx.MockTransport(handler)
+    http_client = httpx.Client(transport=transport, base_url="https://authz.local")
+    sync_client = GoogleAuthzClient(client=http_client, base_url="https://authz.local")
+
+    app = FastAPI()
+
+    @app.get("/inventory")
+    async def read_inventory(
+        auth=Depends(current_user(sync_client)),
+        _=Depends(require_permission("inventory:read", client=sync_client)),
+    ):
+        return {"subject": auth.subject}
+
+    client = TestClient(app)
+    response = client.get("/inventory", headers={"Authorization": "Bearer token"})
+    assert response.status_code == 200
+    assert response.json()["subject"] == "alice"
@@ -1,5 +1,3 @@
-import json
-
 import httpx
 import pytest
 
@@ -10,23 +8,29 @@ flask_module = pytest.importorskip("flask")
 Flask = flask_module.Flask
 g = flask_module.g
 
+# Precomputed response bodies so the mock handler branches on the token in the
+# Authorization header instead of decoding every request body.
+_JSON_HEADERS = {"content-type": "application/json"}
+_AUTHZ_GOOD = b'{"subject": "good-token", "permissions": {"inventory": ["create"]}}'
+_AUTHZ_ANON = b'{"subject": "anon", "permissions": {"inventory": ["create"]}}'
+_CHECK_ALLOWED = b'{"allowed": true, "permitted_actions": ["create"]}'
+_CHECK_DENIED = b'{"allowed": false, "permitted_actions": []}'
+
 
 def _build_flask_app():
     def handler(request: httpx.Request) -> httpx.Response:
+        good = request.headers.get("authorization", "").removeprefix("Bearer ") == "good-token"
         if request.url.path == "/authz":
-            payload = json.loads(request.content.decode())
-            token = payload.get("id_token", "")
             return httpx.Response(
                 200,
-                json={"subject": token, "permissions": {"inventory": ["create"]}},
+                content=_AUTHZ_GOOD if good else _AUTHZ_ANON,
+                headers=_JSON_HEADERS,
             )
         if request.url.path == "/authz/check":
-            payload = json.loads(request.content.decode())
-            token = payload.get("id_token", "")
-            allowed = token == "good-token"
             return httpx.Response(
                 200,
-                json={"allowed": allowed, "permitted_actions": ["create"] if allowed else []},
+                content=_CHECK_ALLOWED if good else _CHECK_DENIED,
+                headers=_JSON_HEADERS,
             )
         raise AssertionError("Unexpected path")
 
@@ -45,21 +49,26 @@ def _build_flask_app():
     return app
 
 
-@pytest.fixture()
+@pytest.fixture(scope="module")
 def flask_app():
     app = _build_flask_app()
     app.config.update(TESTING=True)
     return app
 
 
-def test_flask_helper_allows_valid_token(flask_app):
-    client = flask_app.test_client()
-    response = client.post("/inventory", headers={"Authorization": "Bearer good-token"})
+@pytest.fixture(scope="module")
+def flask_client(flask_app):
+    # App and test-client construction are the expensive part of these tests;
+    # share them across the module.
+    return flask_app.test_client()
+
+
+def test_flask_helper_allows_valid_token(flask_client):
+    response = flask_client.post("/inventory", headers={"Authorization": "Bearer good-token"})
     assert response.status_code == 200
     assert response.get_json()["subject"] == "good-token"
 
 
-def test_flask_helper_blocks_invalid_permission(flask_app):
-    client = flask_app.test_client()
-    response = client.post("/inventory", headers={"Authorization": "Bearer bad-token"})
+def test_flask_helper_blocks_invalid_permission(flask_client):
+    response = flask_client.post("/inventory", headers={"Authorization": "Bearer bad-token"})
     assert response.status_code == 403
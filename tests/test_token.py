@@ -1,4 +1,8 @@
-from google_authz_client.token import discover_token, extract_bearer_token
+from google_authz_client.token import (
+    discover_token,
+    discover_token_fast,
+    extract_bearer_token,
+)
 
 
 def test_extract_bearer_token_handles_prefix():
@@ -8,13 +12,56 @@ def test_extract_bearer_token_handles_prefix():
     assert extract_bearer_token(None) is None
 
 
-def test_discover_token_prefers_cookie():
-    headers = {"Authorization": "Bearer ignored"}
+def test_extract_bearer_token_handles_long_tokens():
+    token = "x" * 4096
+    assert extract_bearer_token(f"Bearer {token}") == token
+    assert extract_bearer_token(f"BEARER  {token} ") == token
+    assert extract_bearer_token(token) == token
+
+
+def test_discover_token_prefers_header():
+    headers = {"Authorization": "Bearer header-token"}
+    cookies = {"session": "cookie-token"}
+    assert discover_token(headers, cookies) == "header-token"
+
+
+def test_discover_token_falls_back_to_cookie():
+    headers = {}
     cookies = {"session": "cookie-token"}
     assert discover_token(headers, cookies) == "cookie-token"
 
 
-def test_discover_token_falls_back_to_header():
+def test_discover_token_skips_lazy_cookies_when_header_present():
+    calls = {"cookies": 0}
+
+    def cookies():
+        calls["cookies"] += 1
+        return {"session": "cookie-token"}
+
     headers = {"Authorization": "Bearer header-token"}
-    cookies = {}
     assert discover_token(headers, cookies) == "header-token"
+    assert calls["cookies"] == 0
+    assert discover_token({}, cookies) == "cookie-token"
+    assert calls["cookies"] == 1
+
+
+class _FakeRequest:
+    def __init__(self, headers, cookies=None, COOKIES=None):
+        self.headers = headers
+        if cookies is not None:
+            self.cookies = cookies
+        if COOKIES is not None:
+            self.COOKIES = COOKIES
+
+
+def test_discover_token_fast_reads_header_then_cookies():
+    request = _FakeRequest({"authorization": "Bearer header-token"}, cookies={})
+    assert discover_token_fast(request) == "header-token"
+
+    request = _FakeRequest({}, cookies={"session": "cookie-token"})
+    assert discover_token_fast(request) == "cookie-token"
+
+    django_request = _FakeRequest({}, COOKIES={"session": "cookie-token"})
+    assert discover_token_fast(django_request) == "cookie-token"
+
+    assert discover_token_fast(_FakeRequest({})) is None
@@ -0,0 +1,55 @@
+"""Parity tests for the optional C-accelerated token helpers.
+
+Skipped entirely when the extension was not compiled; token.py then runs on
+its pure-Python fallbacks, which tests/test_token.py covers.
+"""
+
+import pytest
+
+_token_fast = pytest.importorskip("google_authz_client._token_fast")
+
+from google_authz_client.token import _extract_bearer_token_uncached  # noqa: E402
+
+HEADER_VALUES = [
+    None,
+    "",
+    "   ",
+    "Bearer foo",
+    "bearer bar",
+    "BEARER BAZ",
+    "BeArEr mixed",
+    "BEARER  double-space ",
+    "  Bearer padded  ",
+    "bearer",
+    "bearer ",
+    "bearerx",
+    "Bearers foo",
+    "bearer\ttab",
+    "bearer\0nul-not-space",
+    "Basic abc123",
+    "token-without-scheme",
+    "Bearer " + "x" * 4096,
+]
+
+
+@pytest.mark.parametrize("value", HEADER_VALUES)
+def test_extract_bearer_token_matches_python_fallback(value):
+    assert _token_fast.extract_bearer_token(value) == _extract_bearer_token_uncached(value)
+
+
+def test_is_bearer_prefix_edge_cases():
+    # Long enough for the 8-byte SWAR load, all casings.
+    assert _token_fast.is_bearer_prefix(b"bearer token")
+    assert _token_fast.is_bearer_prefix(b"BEARER TOKEN")
+    assert _token_fast.is_bearer_prefix(b"BeArEr token")
+    # Exactly the prefix: shorter than 8 bytes, takes the strncasecmp path.
+    assert _token_fast.is_bearer_prefix(b"bearer ")
+    assert _token_fast.is_bearer_prefix(b"BEARER ")
+    # Too short, or not the bearer scheme.
+    assert not _token_fast.is_bearer_prefix(b"")
+    assert not _token_fast.is_bearer_prefix(b"bearer")
+    assert not _token_fast.is_bearer_prefix(b"bearerx and more")
+    assert not _token_fast.is_bearer_prefix(b"bearer\ttoken")
+    assert not _token_fast.is_bearer_prefix(b"bearer\0token")
+    assert not _token_fast.is_bearer_prefix(b"Bearers token")
+    assert not _token_fast.is_bearer_prefix(b"Basic abc12345")